@@ -65,11 +65,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up MCZ from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    # Entrées créées avant l'usage du unique_id : on le renseigne a posteriori
+    if entry.unique_id is None and not any(
+        other.unique_id == entry.data["device_id"]
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        hass.config_entries.async_update_entry(entry, unique_id=entry.data["device_id"])
+
     # Crée l’objet qui représente le poêle
     stove = MczStove(
         hass,
         device_id=entry.data["device_id"],
         name=entry.data.get("name", "Poêle MCZ"),
+        options=entry.options,
     )
 
     # Stocke l’instance pour que climate.py (ou autres plateformes) puisse l’utiliser
@@ -78,6 +86,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Charger les plateformes modernes
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Les options sont appliquées à chaud sur le poêle, sans recharger l'entrée
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     return True
 
@@ -87,6 +97,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        stove: MczStove = hass.data[DOMAIN].pop(entry.entry_id)
+        stove.shutdown()
 
     return unload_ok
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Applique les nouvelles options au poêle en cours d'exécution."""
+    stove: MczStove = hass.data[DOMAIN][entry.entry_id]
+    stove.apply_options(entry.options)
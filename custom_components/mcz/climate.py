@@ -1,8 +1,9 @@
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import HVACMode, ClimateEntityFeature, HVACAction
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
 
 
@@ -33,6 +34,7 @@ class MczClimate(ClimateEntity):
     """ClimateEntity pour un poêle MCZ."""
 
     PRESET_MODES = ["eco", "comfort", "sleep", "away", "boost"]
+    _attr_should_poll = False
 
     def __init__(self, stove: MczStove):
         self._stove = stove
@@ -40,8 +42,76 @@ class MczClimate(ClimateEntity):
         self._attr_unique_id = stove.id
         self._attr_preset_modes = self.PRESET_MODES 
         self._attr_preset_mode = None  # état initial
-
-
+        self._policy = None
+        self._command_in_progress = False
+        self._unsub_flush = None
+        self._unsub_heartbeat = None
+
+    async def async_added_to_hass(self):
+        self._policy, remove_policy = self._stove.create_publish_policy(f"{self._stove.id}_climate")
+        self.async_on_remove(remove_policy)
+        self.async_on_remove(self._stove.add_listener(self._handle_stove_update))
+        self.async_on_remove(self._cancel_flush)
+        self.async_on_remove(self._cancel_heartbeat)
+        self._schedule_heartbeat()
+
+    @callback
+    def _handle_stove_update(self):
+        if self._command_in_progress:
+            return  # l'écriture de fin de commande s'en charge
+        if self._policy.should_publish(
+            self._stove.state, self._stove.current_temperature, self._publish_fingerprint()
+        ):
+            self._cancel_flush()
+            self.async_write_ha_state()
+        elif self._policy.flush_delay is not None and self._unsub_flush is None:
+            # Variation retenue par l'intervalle minimal : on la publie à son échéance
+            self._unsub_flush = async_call_later(self.hass, self._policy.flush_delay, self._async_flush)
+        self._schedule_heartbeat()
+
+    def _publish_fingerprint(self) -> tuple:
+        """Attributs dont tout changement doit être écrit sans attendre."""
+        return (self.target_temperature, self.hvac_mode, self.preset_mode, self._stove.is_on)
+
+    @callback
+    def _async_flush(self, _now):
+        self._unsub_flush = None
+        self._handle_stove_update()
+
+    @callback
+    def _cancel_flush(self):
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    @callback
+    def _schedule_heartbeat(self):
+        # Timer propre : max_staleness est garanti même si le keep-alive est plus lent
+        self._cancel_heartbeat()
+        self._unsub_heartbeat = async_call_later(
+            self.hass, self._policy.heartbeat_delay(), self._async_heartbeat
+        )
+
+    @callback
+    def _async_heartbeat(self, _now):
+        self._unsub_heartbeat = None
+        self._handle_stove_update()
+
+    @callback
+    def _cancel_heartbeat(self):
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @callback
+    def _async_write_command_state(self):
+        """Écriture forcée à la fin d'une commande, comptée par la politique."""
+        self._cancel_flush()
+        self._policy.record_publish(
+            self._stove.state, self._stove.current_temperature, self._publish_fingerprint()
+        )
+        self._schedule_heartbeat()
+        self.async_write_ha_state()
 
     @property
     def temperature_unit(self):
@@ -87,25 +157,38 @@ class MczClimate(ClimateEntity):
 
     async def async_set_temperature(self, **kwargs):
         if ATTR_TEMPERATURE in kwargs:
-            await self._stove.async_set_temperature(kwargs[ATTR_TEMPERATURE])
-            self.async_write_ha_state()
+            self._command_in_progress = True
+            try:
+                await self._stove.async_set_temperature(kwargs[ATTR_TEMPERATURE])
+            finally:
+                self._command_in_progress = False
+            self._async_write_command_state()
 
     async def async_set_hvac_mode(self, hvac_mode):
-        if hvac_mode == HVACMode.OFF:
-            await self._stove.async_turn_off()
-        elif hvac_mode == HVACMode.HEAT:
-            await self._stove.async_turn_on()
-            await self._stove.async_set_manual()
-        elif hvac_mode == HVACMode.AUTO:
-            await self._stove.async_turn_on()
-            await self._stove.async_set_auto()
-        self.async_write_ha_state()
+        # Pas d'écriture intermédiaire : turn_on passe par le mode auto avant set_manual
+        self._command_in_progress = True
+        try:
+            if hvac_mode == HVACMode.OFF:
+                await self._stove.async_turn_off()
+            elif hvac_mode == HVACMode.HEAT:
+                await self._stove.async_turn_on()
+                await self._stove.async_set_manual()
+            elif hvac_mode == HVACMode.AUTO:
+                await self._stove.async_turn_on()
+                await self._stove.async_set_auto()
+        finally:
+            self._command_in_progress = False
+        self._async_write_command_state()
 
     async def async_set_preset_mode(self, preset_mode: str):
         if preset_mode in self._attr_preset_modes:
-            await self._stove.async_set_mode(preset_mode)
+            self._command_in_progress = True
+            try:
+                await self._stove.async_set_mode(preset_mode)
+            finally:
+                self._command_in_progress = False
             self._attr_preset_mode = preset_mode
-            self.async_write_ha_state()
+            self._async_write_command_state()
 
     @property
     def supported_features(self):
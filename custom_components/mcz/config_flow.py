@@ -1,22 +1,73 @@
+import asyncio
+
 import voluptuous as vol
 from homeassistant import config_entries
-from .const import DOMAIN
+from homeassistant.core import callback
+from .const import (
+    CONF_KEEP_ALIVE_INTERVAL,
+    CONF_MIN_OFF_DURATION,
+    CONF_PID_KD,
+    CONF_PID_KI,
+    CONF_PID_KP,
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_MAX_STALENESS,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_REPEAT_COUNT,
+    CONF_SHUTDOWN_DURATION,
+    CONF_STARTUP_DURATION,
+    DEFAULT_KEEP_ALIVE_INTERVAL,
+    DEFAULT_MIN_OFF_DURATION,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_PRESET_TEMPERATURES,
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_MAX_STALENESS,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    DEFAULT_REPEAT_COUNT,
+    DEFAULT_SHUTDOWN_DURATION,
+    DEFAULT_STARTUP_DURATION,
+    DOMAIN,
+    preset_option_key,
+)
+from .discovery import MczDiscovery, rfxtrx_automatic_add
+
+# Durée d'écoute passive du flux rfxtrx pendant la découverte
+DISCOVERY_WINDOW = 60  # secondes
 
 
 class MCZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return MCZOptionsFlow(config_entry)
+
+    def __init__(self):
+        self._discovery: MczDiscovery | None = None
+        self._discovery_task: asyncio.Task | None = None
+
     async def async_step_user(self, user_input=None):
-        errors = {}
+        # Sans rfxtrx, ou si son ajout automatique est désactivé, les trames des
+        # poêles inconnus ne sont jamais publiées : saisie manuelle directe
+        if "rfxtrx" not in self.hass.config.components or not rfxtrx_automatic_add(self.hass):
+            return await self.async_step_manual()
+
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["discovery", "manual"],
+        )
+
+    async def async_step_manual(self, user_input=None, errors=None):
+        errors = errors or {}
 
         if user_input is not None:
-            return self.async_create_entry(
-                title=user_input["name"],
-                data={
-                    "device_id": user_input["device_id"],
-                    "name": user_input["name"],
-                },
-            )
+            device_id = user_input["device_id"].strip()
+            if len(device_id) != 6 or not device_id.isdigit():
+                errors["device_id"] = "invalid_device_id"
+            else:
+                return await self._async_create_stove_entry(device_id, user_input["name"])
 
         data_schema = vol.Schema({
             vol.Required("device_id"): str,
@@ -24,7 +75,140 @@ class MCZConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         })
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
         )
+
+    async def async_step_discovery(self, user_input=None):
+        if self._discovery_task is None:
+            self._discovery = MczDiscovery(self.hass)
+            self._discovery.start()
+            self._discovery_task = self.hass.async_create_task(self._async_listen())
+
+        if not self._discovery_task.done():
+            return self.async_show_progress(
+                step_id="discovery",
+                progress_action="listening",
+                progress_task=self._discovery_task,
+            )
+
+        return self.async_show_progress_done(next_step_id="pick_device")
+
+    async def async_step_pick_device(self, user_input=None):
+        if user_input is not None:
+            return await self._async_create_stove_entry(user_input["device_id"], user_input["name"])
+
+        configured = self._configured_device_ids()
+        choices = {
+            device_id: f"{device_id} · {info['frames']} × · RSSI {info['rssi']}"
+            for device_id, info in sorted(
+                self._discovery.devices.items(), key=lambda item: -item[1]["frames"]
+            )
+            if device_id not in configured
+        }
+        if not choices:
+            return await self.async_step_manual(errors={"base": "no_devices_found"})
+
+        data_schema = vol.Schema({
+            vol.Required("device_id"): vol.In(choices),
+            vol.Required("name", default="Poêle MCZ"): str,
+        })
+
+        return self.async_show_form(step_id="pick_device", data_schema=data_schema)
+
+    async def _async_listen(self):
+        try:
+            await asyncio.sleep(DISCOVERY_WINDOW)
+        finally:
+            self._discovery.stop()
+
+    def _configured_device_ids(self) -> set[str]:
+        # Les entrées antérieures au unique_id ne sont connues que par leurs données
+        return {entry.data.get("device_id") for entry in self._async_current_entries()}
+
+    async def _async_create_stove_entry(self, device_id: str, name: str):
+        await self.async_set_unique_id(device_id)
+        self._abort_if_unique_id_configured()
+        if device_id in self._configured_device_ids():
+            return self.async_abort(reason="already_configured")
+        return self.async_create_entry(
+            title=name,
+            data={
+                "device_id": device_id,
+                "name": name,
+            },
+        )
+
+    @callback
+    def async_remove(self):
+        """Flux terminé ou abandonné : on cesse d'écouter immédiatement."""
+        if self._discovery is not None:
+            self._discovery.stop()
+        if self._discovery_task is not None and not self._discovery_task.done():
+            self._discovery_task.cancel()
+
+
+class MCZOptionsFlow(config_entries.OptionsFlow):
+    """Réglages à chaud : temporisations, répétitions, PID et températures des presets."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        # Stocké sous un autre nom : HA ne fournit self.config_entry qu'à partir de 2024.11
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            # Appliqué sur le poêle par le listener de mise à jour, sans rechargement
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        schema = {
+            vol.Required(
+                CONF_KEEP_ALIVE_INTERVAL,
+                default=options.get(CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(
+                CONF_REPEAT_COUNT,
+                default=options.get(CONF_REPEAT_COUNT, DEFAULT_REPEAT_COUNT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Required(
+                CONF_STARTUP_DURATION,
+                default=options.get(CONF_STARTUP_DURATION, DEFAULT_STARTUP_DURATION),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
+            vol.Required(
+                CONF_SHUTDOWN_DURATION,
+                default=options.get(CONF_SHUTDOWN_DURATION, DEFAULT_SHUTDOWN_DURATION),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
+            vol.Required(
+                CONF_MIN_OFF_DURATION,
+                default=options.get(CONF_MIN_OFF_DURATION, DEFAULT_MIN_OFF_DURATION),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=240)),
+            vol.Required(
+                CONF_PID_KP, default=options.get(CONF_PID_KP, DEFAULT_PID_KP)
+            ): vol.Coerce(float),
+            vol.Required(
+                CONF_PID_KI, default=options.get(CONF_PID_KI, DEFAULT_PID_KI)
+            ): vol.Coerce(float),
+            vol.Required(
+                CONF_PID_KD, default=options.get(CONF_PID_KD, DEFAULT_PID_KD)
+            ): vol.Coerce(float),
+            vol.Required(
+                CONF_PUBLISH_DEADBAND,
+                default=options.get(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Required(
+                CONF_PUBLISH_MIN_INTERVAL,
+                default=options.get(CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_PUBLISH_MAX_STALENESS,
+                default=options.get(CONF_PUBLISH_MAX_STALENESS, DEFAULT_PUBLISH_MAX_STALENESS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+        }
+        for preset, default in DEFAULT_PRESET_TEMPERATURES.items():
+            key = preset_option_key(preset)
+            schema[vol.Required(key, default=options.get(key, default))] = vol.All(
+                vol.Coerce(float), vol.Range(min=5, max=30)
+            )
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
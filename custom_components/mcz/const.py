@@ -1,3 +1,43 @@
 """COnstants for mcz app"""
 DOMAIN= "mcz"
 PLATFORMS = ["climate", "sensor", "number", "switch"]
+
+# Options (réglables à chaud via l'options flow)
+CONF_KEEP_ALIVE_INTERVAL = "keep_alive_interval"  # minutes
+CONF_REPEAT_COUNT = "repeat_count"
+CONF_STARTUP_DURATION = "startup_duration"  # minutes
+CONF_SHUTDOWN_DURATION = "shutdown_duration"  # minutes
+CONF_MIN_OFF_DURATION = "min_off_duration"  # minutes
+CONF_PID_KP = "pid_kp"
+CONF_PID_KI = "pid_ki"
+CONF_PID_KD = "pid_kd"
+
+DEFAULT_KEEP_ALIVE_INTERVAL = 5
+DEFAULT_REPEAT_COUNT = 3
+DEFAULT_STARTUP_DURATION = 15
+DEFAULT_SHUTDOWN_DURATION = 2
+DEFAULT_MIN_OFF_DURATION = 30
+DEFAULT_PID_KP = 1.0
+DEFAULT_PID_KI = 0.1
+DEFAULT_PID_KD = 0.05
+DEFAULT_PRESET_TEMPERATURES = {
+    "eco": 19.0,
+    "comfort": 21.0,
+    "sleep": 18.0,
+    "away": 16.0,
+    "boost": 23.0,
+}
+
+# Limitation des écritures d'état (climate / sensor)
+CONF_PUBLISH_DEADBAND = "publish_deadband"  # °C
+CONF_PUBLISH_MIN_INTERVAL = "publish_min_interval"  # secondes
+CONF_PUBLISH_MAX_STALENESS = "publish_max_staleness"  # secondes
+
+DEFAULT_PUBLISH_DEADBAND = 0.2
+DEFAULT_PUBLISH_MIN_INTERVAL = 30
+DEFAULT_PUBLISH_MAX_STALENESS = 600
+
+
+def preset_option_key(preset: str) -> str:
+    """Clé d'option pour la température d'un preset (ex: "eco_temperature")."""
+    return f"{preset}_temperature"
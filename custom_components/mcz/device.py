@@ -2,6 +2,33 @@ import logging
 from datetime import timedelta, datetime
 from homeassistant.helpers.event import async_track_time_interval
 from .pid import PIDController
+from .publish import StatePublishPolicy
+from .const import (
+    CONF_KEEP_ALIVE_INTERVAL,
+    CONF_MIN_OFF_DURATION,
+    CONF_PID_KD,
+    CONF_PID_KI,
+    CONF_PID_KP,
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_MAX_STALENESS,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_REPEAT_COUNT,
+    CONF_SHUTDOWN_DURATION,
+    CONF_STARTUP_DURATION,
+    DEFAULT_KEEP_ALIVE_INTERVAL,
+    DEFAULT_MIN_OFF_DURATION,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_PRESET_TEMPERATURES,
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_MAX_STALENESS,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    DEFAULT_REPEAT_COUNT,
+    DEFAULT_SHUTDOWN_DURATION,
+    DEFAULT_STARTUP_DURATION,
+    preset_option_key,
+)
 from enum import Enum
 
 
@@ -19,16 +46,23 @@ class StoveState(Enum):
 
 class MczStove:
     """Représente un poêle MCZ contrôlé via son ID."""   
-    STARTUP_DURATION = timedelta(minutes=15)  # durée fixe du cycle de démarrage
-    SHUTDOWN_DURATION = timedelta(minutes=2)  # durée d'extinction simulée
+    STARTUP_DURATION = timedelta(minutes=DEFAULT_STARTUP_DURATION)  # durée par défaut du cycle de démarrage
+    SHUTDOWN_DURATION = timedelta(minutes=DEFAULT_SHUTDOWN_DURATION)  # durée d'extinction simulée
+    PRESET_MODES = {
+        "eco": 3,
+        "comfort": 4,
+        "sleep": 5,
+        "away": 6,
+        "boost": 7,
+    }
 
     
 
-    def __init__(self, hass, device_id: str, name: str = "Poêle MCZ"):
+    def __init__(self, hass, device_id: str, name: str = "Poêle MCZ", options: dict | None = None):
         self.hass = hass
         self._device_id = device_id
         self._name = name
-        self._pid = PIDController(kp=1.0, ki=0.1, kd=0.05)
+        self._pid = PIDController(kp=DEFAULT_PID_KP, ki=DEFAULT_PID_KI, kd=DEFAULT_PID_KD)
 
         # États internes simulés
         self._is_on = False
@@ -45,15 +79,36 @@ class MczStove:
         # Sauvegarde de la dernière trame envoyée
         self._last_frame = None
 
+        # Paramètres de temporisation (modifiables via apply_options)
+        self._startup_duration = self.STARTUP_DURATION
+        self._shutdown_duration = self.SHUTDOWN_DURATION
+        self._startup_end_time: datetime | None = None
+        self._shutdown_end_time: datetime | None = None
+        self._repeat_count = DEFAULT_REPEAT_COUNT
+        self._preset_temperatures = dict(DEFAULT_PRESET_TEMPERATURES)
+
                 # Protection anti-cyclage
         self._last_off_time: datetime | None = None
-        self._min_off_duration = timedelta(minutes=30)  # par défaut 30 min
+        self._min_off_duration = timedelta(minutes=DEFAULT_MIN_OFF_DURATION)  # par défaut 30 min
 
                 # Planifie l’envoi périodique
-        async_track_time_interval(hass, self._async_keep_alive, timedelta(minutes=5))
+        self._keep_alive_interval = timedelta(minutes=DEFAULT_KEEP_ALIVE_INTERVAL)
+        self._unsub_keep_alive = async_track_time_interval(
+            hass, self._async_keep_alive, self._keep_alive_interval
+        )
 
         self._state = StoveState.OFF
 
+        # Entités abonnées aux mises à jour et leurs politiques de publication
+        self._listeners: list = []
+        self._publish_policies: list[StatePublishPolicy] = []
+        self._publish_deadband = DEFAULT_PUBLISH_DEADBAND
+        self._publish_min_interval = DEFAULT_PUBLISH_MIN_INTERVAL
+        self._publish_max_staleness = DEFAULT_PUBLISH_MAX_STALENESS
+
+        if options:
+            self.apply_options(options)
+
 
 
     # --- Accesseurs ---
@@ -112,6 +167,15 @@ class MczStove:
     def state(self) -> StoveState:
         return self._state
 
+    @property
+    def min_off_duration(self) -> timedelta:
+        return self._min_off_duration
+
+    @property
+    def publish_stats(self) -> dict:
+        """Compteurs d'écritures publiées / supprimées par entité."""
+        return {policy.name: policy.as_dict() for policy in self._publish_policies}
+
      # ----------------
     # Helpers
     # ----------------
@@ -164,7 +228,7 @@ class MczStove:
             _LOGGER.warning("[DEBUG MODE] Trame non envoyée, seulement loguée: %s", frame)
             return
 
-        for i in range(3):  # 3 répétitions
+        for i in range(self._repeat_count):
             _LOGGER.debug("Envoi trame MCZ (%s): %s", i+1, frame)
             await self.hass.services.async_call(
                 "rfxtrx", "send",
@@ -192,6 +256,9 @@ class MczStove:
             _LOGGER.debug("Réémission périodique de la trame")
             await self._send_frame()
 
+        # Une seule notification par tick ; les entités filtrent via leur StatePublishPolicy
+        self._notify_listeners()
+
 
    # --- Helpers internes ---
     def _set_state(self, new_state: StoveState):
@@ -199,13 +266,103 @@ class MczStove:
             _LOGGER.info("Changement d'état du poêle %s: %s → %s", self._device_id, self._state.name, new_state.name)
             self._state = new_state
             if new_state == StoveState.STARTUP:
-                self._startup_end_time = datetime.now() + self.STARTUP_DURATION
+                self._startup_end_time = datetime.now() + self._startup_duration
             elif new_state == StoveState.SHUTDOWN:
-                self._shutdown_end_time = datetime.now() + self.SHUTDOWN_DURATION
+                self._shutdown_end_time = datetime.now() + self._shutdown_duration
             elif new_state == StoveState.OFF:
                 self._startup_end_time = None
                 self._shutdown_end_time = None
 
+    # --- Abonnements des entités ---
+    def create_publish_policy(self, name: str):
+        """Crée une politique de publication suivant les options courantes.
+
+        Retourne (politique, fonction de désenregistrement), comme add_listener.
+        """
+        policy = StatePublishPolicy(
+            name,
+            self._publish_deadband,
+            self._publish_min_interval,
+            self._publish_max_staleness,
+        )
+        self._publish_policies.append(policy)
+
+        def remove_policy():
+            self._publish_policies.remove(policy)
+
+        return policy, remove_policy
+
+    def add_listener(self, update_callback):
+        """Abonne une entité aux mises à jour ; retourne la fonction de désabonnement."""
+        self._listeners.append(update_callback)
+
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify_listeners(self):
+        """À appeler en fin de commande ou de tick, jamais depuis _set_state (état intermédiaire)."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    # --- Options ---
+    def apply_options(self, options: dict):
+        """Applique les options à chaud, sans recharger l'entrée ni recréer les entités."""
+        keep_alive = timedelta(minutes=options.get(CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL))
+        startup = timedelta(minutes=options.get(CONF_STARTUP_DURATION, DEFAULT_STARTUP_DURATION))
+        shutdown = timedelta(minutes=options.get(CONF_SHUTDOWN_DURATION, DEFAULT_SHUTDOWN_DURATION))
+
+        # Décale les échéances en cours plutôt que de relancer le cycle
+        if self._startup_end_time is not None:
+            self._startup_end_time += startup - self._startup_duration
+        if self._shutdown_end_time is not None:
+            self._shutdown_end_time += shutdown - self._shutdown_duration
+        self._startup_duration = startup
+        self._shutdown_duration = shutdown
+
+        self._repeat_count = int(options.get(CONF_REPEAT_COUNT, DEFAULT_REPEAT_COUNT))
+        self._min_off_duration = timedelta(minutes=options.get(CONF_MIN_OFF_DURATION, DEFAULT_MIN_OFF_DURATION))
+
+        self._pid.kp = options.get(CONF_PID_KP, DEFAULT_PID_KP)
+        self._pid.ki = options.get(CONF_PID_KI, DEFAULT_PID_KI)
+        self._pid.kd = options.get(CONF_PID_KD, DEFAULT_PID_KD)
+
+        previous_temperatures = self._preset_temperatures
+        self._preset_temperatures = {
+            preset: options.get(preset_option_key(preset), default)
+            for preset, default in DEFAULT_PRESET_TEMPERATURES.items()
+        }
+        # Le preset actif suit immédiatement sa nouvelle température
+        for preset, mode in self.PRESET_MODES.items():
+            if mode == self._mode and self._preset_temperatures[preset] != previous_temperatures[preset]:
+                self._target_temp = self._preset_temperatures[preset]
+
+        self._publish_deadband = options.get(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND)
+        self._publish_min_interval = options.get(CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL)
+        self._publish_max_staleness = options.get(CONF_PUBLISH_MAX_STALENESS, DEFAULT_PUBLISH_MAX_STALENESS)
+        for policy in self._publish_policies:
+            policy.configure(
+                self._publish_deadband,
+                self._publish_min_interval,
+                self._publish_max_staleness,
+            )
+
+        # Ne réarme le keep-alive que si l'intervalle a changé
+        if keep_alive != self._keep_alive_interval:
+            self._keep_alive_interval = keep_alive
+            self._unsub_keep_alive()
+            self._unsub_keep_alive = async_track_time_interval(
+                self.hass, self._async_keep_alive, keep_alive
+            )
+
+        _LOGGER.debug("Options appliquées pour %s: %s", self._device_id, options)
+        self._notify_listeners()
+
+    def shutdown(self):
+        """Annule le keep-alive périodique (déchargement de l'entrée)."""
+        self._unsub_keep_alive()
+
     # --- Commandes asynchrones ---
 
     async def async_turn_on(self):
@@ -214,6 +371,7 @@ class MczStove:
         self._mode = 2  # Mode AUTO par défaut quand on allume
         self._set_state(StoveState.STARTUP)
         await self._send_frame()
+        self._notify_listeners()
 
     async def async_apply_pid(self, pid_power: float):
         now = datetime.now()
@@ -241,6 +399,7 @@ class MczStove:
         self._set_state(StoveState.SHUTDOWN)
         self._last_off_time = datetime.now()  # mémorise l'heure de l'arrêt
         await self._send_frame()
+        self._notify_listeners()
 
 
     async def async_set_temperature(self, temperature: float):
@@ -248,32 +407,19 @@ class MczStove:
         _LOGGER.debug("Envoi température=%s pour %s", temperature, self._device_id)
         self._target_temp = temperature
         await self._send_frame()
+        self._notify_listeners()
 
     async def async_set_mode(self, mode: str):
-        mapping = {
-            "eco": 3,
-            "comfort": 4,
-            "sleep": 5,
-            "away": 6,     # <-- ajouté
-            "boost": 7,    # <-- ajouté
-        }
+        mapping = self.PRESET_MODES
         if mode in mapping:
             self._mode = mapping[mode]
             _LOGGER.debug("Changement de mode=%s (%s) pour %s", mode, self._mode, self._device_id)
-            if mode == "eco":
-                self._target_temp = 19
-            elif mode == "comfort":
-                self._target_temp = 21
-            elif mode == "sleep":
-                self._target_temp = 18
-            elif mode == "away":
-                self._target_temp = 16
-            elif mode == "boost":
-                self._target_temp = 23
+            self._target_temp = self._preset_temperatures[mode]
         else:
             _LOGGER.warning("Mode inconnu: %s", mode)
 
         await self._send_frame()
+        self._notify_listeners()
 
     async def async_set_flame_power(self, power: int):
         """Réglage de la puissance de la flamme (1-5)."""
@@ -303,8 +449,10 @@ class MczStove:
         self._mode = 1
         _LOGGER.debug("Mode manuel activé pour %s", self._device_id)
         await self._send_frame()
+        self._notify_listeners()
 
     async def async_set_auto(self):  # <-- ajouté
         self._mode = 2
         _LOGGER.debug("Mode auto activé pour %s", self._device_id)
         await self._send_frame()
+        self._notify_listeners()
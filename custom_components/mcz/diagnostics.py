@@ -15,6 +15,7 @@ async def async_get_config_entry_diagnostics(
         "entry_data": entry.data,       # données de config
         "options": entry.options,       # options de l’entrée
         "internal_state": data_integration,  # état interne qu’on veut exposer
+        "publish_stats": getattr(data_integration, "publish_stats", {}),  # écritures publiées / supprimées
     }
 
     return diagnostics
@@ -0,0 +1,72 @@
+import logging
+import time
+
+from homeassistant.core import Event, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Événement publié par l'intégration rfxtrx pour chaque trame reçue
+EVENT_RFXTRX_EVENT = "rfxtrx_event"
+# Option rfxtrx : sans elle, seuls les appareils déjà connus émettent rfxtrx_event
+RFXTRX_CONF_AUTOMATIC_ADD = "automatic_add"
+# En-tête des trames MCZ (cf. MczStove.build_frame), en hexadécimal minuscule
+FRAME_PREFIX = "0c4302"
+# Longueur minimale : en-tête (3) + compteur (1) + device_id (3) octets
+MIN_FRAME_LENGTH = 2 * 7
+DISCOVERY_MAX_DEVICES = 16
+
+
+def rfxtrx_automatic_add(hass: HomeAssistant) -> bool:
+    """True si une entrée rfxtrx a l'ajout automatique activé (requis pour la découverte)."""
+    return any(
+        entry.data.get(RFXTRX_CONF_AUTOMATIC_ADD) or entry.options.get(RFXTRX_CONF_AUTOMATIC_ADD)
+        for entry in hass.config_entries.async_entries("rfxtrx")
+    )
+
+
+class MczDiscovery:
+    """Écoute passive du flux rfxtrx pour recenser les device_id MCZ visibles."""
+
+    def __init__(self, hass: HomeAssistant, max_devices: int = DISCOVERY_MAX_DEVICES):
+        self.hass = hass
+        self._max_devices = max_devices
+        self._devices: dict[str, dict] = {}
+        self._unsub = None
+
+    @property
+    def devices(self) -> dict[str, dict]:
+        """device_id -> {"frames", "rssi", "last_seen"}."""
+        return self._devices
+
+    def start(self):
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(EVENT_RFXTRX_EVENT, self._handle_event)
+
+    def stop(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _handle_event(self, event: Event):
+        data = event.data.get("data")
+        # Filtre le plus tôt possible : la quasi-totalité du trafic n'est pas MCZ
+        if not isinstance(data, str) or not data.startswith(FRAME_PREFIX) or len(data) < MIN_FRAME_LENGTH:
+            return
+
+        device_id = data[8:14]
+        device = self._devices.get(device_id)
+        if device is None:
+            if len(self._devices) >= self._max_devices or not device_id.isdigit():
+                return
+            device = self._devices[device_id] = {"frames": 0, "rssi": None, "last_seen": None}
+            _LOGGER.debug("Poêle MCZ détecté: %s", device_id)
+
+        device["frames"] += 1
+        device["last_seen"] = time.monotonic()
+        values = event.data.get("values") or {}
+        rssi = values.get("Rssi numeric")
+        if rssi is None:
+            # Quartet haut du dernier octet de la trame RFXtrx
+            rssi = int(data[-2], 16)
+        device["rssi"] = rssi
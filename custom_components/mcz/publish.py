@@ -0,0 +1,91 @@
+import time
+
+# Marge sur max_staleness : le timer de heartbeat peut se déclencher un peu tôt ou tard
+HEARTBEAT_TOLERANCE = 1.0  # secondes
+
+
+class StatePublishPolicy:
+    """Décide si une entité doit réécrire son état (bande morte, intervalle min, heartbeat)."""
+
+    def __init__(self, name: str, deadband: float, min_interval: float, max_staleness: float):
+        self.name = name
+        self.configure(deadband, min_interval, max_staleness)
+        self._last_state = None
+        self._last_temperature: float | None = None
+        self._last_attributes = None
+        self._last_publish: float | None = None
+        # Délai (s) après lequel une variation retenue par min_interval doit être revérifiée
+        self.flush_delay: float | None = None
+
+        # Compteurs pour arbitrer taille de la base / fraîcheur de l'UI
+        self.published = 0
+        self.suppressed = 0
+        self.state_changes = 0
+        self.heartbeats = 0
+
+    def configure(self, deadband: float, min_interval: float, max_staleness: float):
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.max_staleness = max_staleness
+
+    def should_publish(self, state, temperature: float | None = None, attributes=None) -> bool:
+        """Retourne True (et mémorise la publication) si l'état doit être écrit.
+
+        `attributes` est une empreinte (tuple) des autres attributs affichés :
+        tout changement passe immédiatement, comme un changement de StoveState.
+        """
+        now = time.monotonic()
+        self.flush_delay = None
+
+        if self._last_publish is None:
+            publish = True
+        elif state != self._last_state or attributes != self._last_attributes:
+            # Un changement de StoveState (ou d'un attribut affiché) passe toujours immédiatement
+            self.state_changes += 1
+            publish = True
+        else:
+            elapsed = now - self._last_publish
+            if elapsed >= self.max_staleness - HEARTBEAT_TOLERANCE:
+                self.heartbeats += 1
+                publish = True
+            else:
+                moved = (
+                    temperature is not None
+                    and self._last_temperature is not None
+                    and abs(temperature - self._last_temperature) >= self.deadband
+                )
+                publish = moved and elapsed >= self.min_interval
+                if moved and not publish:
+                    self.flush_delay = self.min_interval - elapsed
+
+        if not publish:
+            self.suppressed += 1
+            return False
+
+        self.record_publish(state, temperature, attributes)
+        return True
+
+    def record_publish(self, state, temperature: float | None = None, attributes=None):
+        """Mémorise une écriture faite hors politique (ex: fin d'une commande de l'entité)."""
+        self.published += 1
+        self._last_state = state
+        self._last_temperature = temperature
+        self._last_attributes = attributes
+        self._last_publish = time.monotonic()
+
+    def heartbeat_delay(self) -> float:
+        """Secondes restantes avant que la dernière écriture ne dépasse max_staleness."""
+        if self._last_publish is None:
+            return self.max_staleness
+        return max(0.0, self.max_staleness - (time.monotonic() - self._last_publish))
+
+    def as_dict(self) -> dict:
+        return {
+            "published": self.published,
+            "suppressed": self.suppressed,
+            "state_changes": self.state_changes,
+            "heartbeats": self.heartbeats,
+            "deadband": self.deadband,
+            "min_interval": self.min_interval,
+            "max_staleness": self.max_staleness,
+        }
@@ -1,7 +1,8 @@
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN
 from .device import MczStove
@@ -19,10 +20,45 @@ async def async_setup_entry(
 class MczStoveStateSensor(SensorEntity):
     """Expose l’état du poêle MCZ comme un capteur."""
 
+    _attr_should_poll = False
+
     def __init__(self, stove: MczStove):
         self._stove = stove
         self._attr_name = f"{stove.name} State"
         self._attr_unique_id = f"{stove.id}_state"
+        self._policy = None
+        self._unsub_heartbeat = None
+
+    async def async_added_to_hass(self):
+        self._policy, remove_policy = self._stove.create_publish_policy(self._attr_unique_id)
+        self.async_on_remove(remove_policy)
+        self.async_on_remove(self._stove.add_listener(self._handle_stove_update))
+        self.async_on_remove(self._cancel_heartbeat)
+        self._schedule_heartbeat()
+
+    @callback
+    def _handle_stove_update(self):
+        if self._policy.should_publish(self._stove.state):
+            self.async_write_ha_state()
+        self._schedule_heartbeat()
+
+    @callback
+    def _schedule_heartbeat(self):
+        self._cancel_heartbeat()
+        self._unsub_heartbeat = async_call_later(
+            self.hass, self._policy.heartbeat_delay(), self._async_heartbeat
+        )
+
+    @callback
+    def _async_heartbeat(self, _now):
+        self._unsub_heartbeat = None
+        self._handle_stove_update()
+
+    @callback
+    def _cancel_heartbeat(self):
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
 
     @property
     def native_value(self):